@@ -1,10 +1,23 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from typing import List, Optional
 from datetime import date
 
-app = FastAPI()
+import storage
+from models import CarCreateDTO, CarDTO, GarageCreateDTO, GarageDTO
+from storage import (add_car_to_db, add_garage_to_db, car_to_dto, cf,
+                     delete_car_from_db, delete_garage_from_db, filter_cars,
+                     garage_to_dto, update_car_in_db, update_garage_in_db,
+                     write_lock)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# Prebuilt list serializers: one pydantic-core pass per response instead
+# of one per item
+_garage_list_adapter = TypeAdapter(List[GarageDTO])
+_car_list_adapter = TypeAdapter(List[CarDTO])
 
 origins = [
     "http://localhost:3000",  # React frontend URL
@@ -19,139 +32,45 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mock data storage
-garages_db = []
-cars_db = []
-
-
-# Input DTOs
-class GarageCreateDTO(BaseModel):
-    name: str
-    location: str
-    city: str
-    capacity: int
-
-class CarCreateDTO(BaseModel):
-    make: str
-    model: str
-    productionYear: int
-    licensePlate: str
-    garageIds: List[int]  # A list of garage IDs
-
-
-
-# Output DTOs
-class GarageDTO(BaseModel):
-    id: int
-    name: str
-    location: str
-    city: str
-    capacity: int
-
-class CarDTO(BaseModel):
-    id: int
-    make: str
-    model: str
-    productionYear: int
-    licensePlate: str
-    garages: List[GarageDTO]  # A list of associated garages
-
-
-
-
-# Garage-related functions
-def get_garage_by_id(garage_id: int) -> Optional[GarageDTO]:
-    for garage in garages_db:
-        if garage.id == garage_id:
-            return garage
-    return None
-
-def add_garage_to_db(garage_create_dto: GarageCreateDTO) -> GarageDTO:
-    garage_id = len(garages_db) + 1  # Assign the id to the new garage
-    new_garage = GarageDTO(id=garage_id, **garage_create_dto.dict())
-    garages_db.append(new_garage)
-    return new_garage
-
-def update_garage_in_db(garage_id: int, garage_dto: GarageDTO) -> Optional[GarageDTO]:
-    for index, existing_garage in enumerate(garages_db):
-        if existing_garage.id == garage_id:
-            garages_db[index] = garage_dto
-            return garage_dto
-    return None
-
-def delete_garage_from_db(garage_id: int) -> Optional[GarageDTO]:
-    for index, garage in enumerate(garages_db):
-        if garage.id == garage_id:
-            return garages_db.pop(index)
-    return None
-
-# Car-related functions
-def get_car_by_id(car_id: int) -> Optional[CarDTO]:
-    for car in cars_db:
-        if car.id == car_id:
-            return car
-    return None
-
-def add_car_to_db(car_create_dto: CarCreateDTO) -> CarDTO:
-    car_id = len(cars_db) + 1
-    new_car = CarDTO(id=car_id, **car_create_dto.dict(), garages=[])
-    # Assign garages to car based on garage IDs
-    for garage_id in car_create_dto.garageIds:
-        garage = get_garage_by_id(garage_id)
-        if garage:
-            new_car.garages.append(garage)
-    cars_db.append(new_car)
-    return new_car
-
-def update_car_in_db(car_id: int, car_dto: CarDTO) -> Optional[CarDTO]:
-    for index, existing_car in enumerate(cars_db):
-        if existing_car.id == car_id:
-            cars_db[index] = car_dto
-            return car_dto
-    return None
-
-def delete_car_from_db(car_id: int) -> Optional[CarDTO]:
-    for index, car in enumerate(cars_db):
-        if car.id == car_id:
-            return cars_db.pop(index)
-    return None
-
-
 
 # Garage route
 @app.get("/garages", response_model=List[GarageDTO])
 async def get_garages(city: Optional[str] = None):
-    if city:
-        filtered_garages = [garage for garage in garages_db if garage.city.lower() == city.lower()]
-        return filtered_garages
-    return garages_db
+    cache_key = ("garages", storage.garages_version, cf(city) if city else None)
+    content = storage.get_cached_response(cache_key)
+    if content is None:
+        if city:
+            garage_ids = storage.city_index.get(cf(city), ())
+            results = [storage.garages_db[garage_id] for garage_id in garage_ids]
+        else:
+            results = list(storage.garages_db.values())
+        content = _garage_list_adapter.dump_json([garage_to_dto(garage) for garage in results])
+        storage.cache_response(cache_key, content)
+    return Response(content=content, media_type="application/json")
 
 @app.post("/garages", response_model=GarageDTO)
 async def add_garage(garage_create_dto: GarageCreateDTO):
-    garage = add_garage_to_db(garage_create_dto)
-    return garage
+    async with write_lock:
+        garage = add_garage_to_db(garage_create_dto)
+    return garage_to_dto(garage)
 
 @app.put("/garages/{garage_id}", response_model=GarageDTO)
 async def update_garage(garage_id: int, garage_dto: GarageCreateDTO):
-    existing_garage = get_garage_by_id(garage_id)
-    if not existing_garage:
-        raise HTTPException(status_code=404, detail="Garage not found")
-
-
-    updated_garage = GarageDTO(id=garage_id, **garage_dto.dict())
-    updated_garage = update_garage_in_db(garage_id, updated_garage)
+    async with write_lock:
+        updated_garage = update_garage_in_db(garage_id, garage_dto)
 
     if not updated_garage:
         raise HTTPException(status_code=404, detail="Garage not found")
 
-    return updated_garage
+    return garage_to_dto(updated_garage)
 
 @app.delete("/garages/{garage_id}", response_model=GarageDTO)
 async def delete_garage(garage_id: int):
-    removed_garage = delete_garage_from_db(garage_id)
+    async with write_lock:
+        removed_garage = delete_garage_from_db(garage_id)
     if not removed_garage:
         raise HTTPException(status_code=404, detail="Garage not found")
-    return removed_garage
+    return garage_to_dto(removed_garage)
 
 # Car routes
 @app.get("/cars", response_model=List[CarDTO])
@@ -160,54 +79,38 @@ async def get_cars(carMake: Optional[str] = None,
                    fromYear: Optional[int] = None,
                    toYear: Optional[int] = None):
 
-    filtered_cars = cars_db
-
-    # Apply filters
-    if carMake:
-        filtered_cars = [car for car in filtered_cars if car.make.lower() == carMake.lower()]
-
-    if garageId:
-        filtered_cars = [car for car in filtered_cars if any(garage.id == garageId for garage in car.garages)]
-
-    if fromYear:
-        filtered_cars = [car for car in filtered_cars if car.productionYear >= fromYear]
-
-    if toYear:
-        filtered_cars = [car for car in filtered_cars if car.productionYear <= toYear]
-
-
-    return filtered_cars
+    # Car responses join garages, so the key covers both store versions
+    cache_key = ("cars", storage.cars_version, storage.garages_version,
+                 cf(carMake) if carMake else None, garageId, fromYear, toYear)
+    content = storage.get_cached_response(cache_key)
+    if content is None:
+        results = [car_to_dto(car) for car in filter_cars(carMake, garageId, fromYear, toYear)]
+        content = _car_list_adapter.dump_json(results)
+        storage.cache_response(cache_key, content)
+    return Response(content=content, media_type="application/json")
 
 @app.post("/cars", response_model=CarDTO)
 async def add_car(car_create_dto: CarCreateDTO):
-    car = add_car_to_db(car_create_dto)
-    return car
+    async with write_lock:
+        car = add_car_to_db(car_create_dto)
+    return car_to_dto(car)
 
 @app.put("/cars/{car_id}", response_model=CarDTO)
 async def update_car(car_id: int, car_dto: CarCreateDTO):
-    existing_car = get_car_by_id(car_id)
-    if not existing_car:
-        raise HTTPException(status_code=404, detail="Car not found")
-
-    updated_car = CarDTO(id=car_id, **car_dto.dict(), garages=[])
-    # Assign updated garages based on garage IDs
-    for garage_id in car_dto.garageIds:
-        garage = get_garage_by_id(garage_id)
-        if garage:
-            updated_car.garages.append(garage)
-
-    updated_car = update_car_in_db(car_id, updated_car)
+    async with write_lock:
+        updated_car = update_car_in_db(car_id, car_dto)
     if not updated_car:
         raise HTTPException(status_code=404, detail="Car not found")
 
-    return updated_car
+    return car_to_dto(updated_car)
 
 @app.delete("/cars/{car_id}", response_model=CarDTO)
 async def delete_car(car_id: int):
-    removed_car = delete_car_from_db(car_id)
+    async with write_lock:
+        removed_car = delete_car_from_db(car_id)
     if not removed_car:
         raise HTTPException(status_code=404, detail="Car not found")
-    return removed_car
+    return car_to_dto(removed_car)
 
 
 
@@ -215,5 +118,22 @@ async def delete_car(car_id: int):
 
 @app.get("/cars/dailyAvailabilityReport", response_model=List[GarageDTO])
 async def get_car_report(start_date: date, end_date: date):
-
-    return garages_db
+    # Mock report: serves the cached full garage listing without
+    # revalidating every garage per call
+    cache_key = ("garages", storage.garages_version, None)
+    content = storage.get_cached_response(cache_key)
+    if content is None:
+        content = _garage_list_adapter.dump_json([garage_to_dto(garage)
+                                                  for garage in storage.garages_db.values()])
+        storage.cache_response(cache_key, content)
+    return Response(content=content, media_type="application/json")
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop and httptools come with uvicorn[standard]. The stores and
+    # indexes live in-process, so stay on a single worker until they move
+    # to a shared backend; more workers would each see their own data.
+    uvicorn.run("garageNcar:app", host="0.0.0.0", port=8000,
+                loop="uvloop", http="httptools", access_log=False)
@@ -0,0 +1,70 @@
+# Shared request/response schemas and internal storage records
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict
+from typing import List
+
+
+# Input DTOs: reject unknown client keys at the edge
+class GarageCreateDTO(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    name: str
+    location: str
+    city: str
+    capacity: int
+
+class CarCreateDTO(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    make: str
+    model: str
+    productionYear: int
+    licensePlate: str
+    garageIds: List[int]  # A list of garage IDs
+
+
+
+# Output DTOs: frozen so pydantic-core skips mutation bookkeeping
+class GarageDTO(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    id: int
+    name: str
+    location: str
+    city: str
+    capacity: int
+
+class CarDTO(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+
+    id: int
+    make: str
+    model: str
+    productionYear: int
+    licensePlate: str
+    garages: List[GarageDTO]  # A list of associated garages
+
+
+# Internal storage records: cars keep garage ids only and both records
+# carry their casefolded filter fields, computed once at write time, so
+# the read path never normalizes strings. The wire DTOs above are
+# projected from these at the route boundary. Slots keep per-record
+# memory flat and make attribute access a fixed-offset load.
+@dataclass(slots=True)
+class GarageRecord:
+    id: int
+    name: str
+    location: str
+    city: str
+    capacity: int
+    city_cf: str
+
+@dataclass(slots=True)
+class CarRecord:
+    id: int
+    make: str
+    model: str
+    productionYear: int
+    licensePlate: str
+    garage_ids: List[int]
+    make_cf: str
@@ -0,0 +1,218 @@
+# In-memory stores, secondary indexes, and the response cache shared by
+# every route
+import asyncio
+import itertools
+
+from functools import lru_cache
+from sortedcontainers import SortedList
+from typing import Dict, List, Optional, Set
+
+from models import (CarCreateDTO, CarDTO, CarRecord, GarageCreateDTO,
+                    GarageDTO, GarageRecord)
+
+# Mock data storage, keyed by id for O(1) lookup
+garages_db: Dict[int, GarageRecord] = {}
+cars_db: Dict[int, CarRecord] = {}
+
+# Id generators (monotonic, safe against delete-then-insert reuse)
+_next_garage_id = itertools.count(1)
+_next_car_id = itertools.count(1)
+
+# Serializes mutations of the stores and their indexes on the event loop
+write_lock = asyncio.Lock()
+
+# Secondary index: casefolded city -> ids of garages in that city
+city_index: Dict[str, Set[int]] = {}
+
+# Secondary index: garage id -> ids of cars assigned to that garage
+cars_by_garage: Dict[int, Set[int]] = {}
+
+# Range index: (productionYear, car id) pairs sorted by year
+year_index: SortedList = SortedList(key=lambda entry: entry[0])
+
+# Secondary index: casefolded make -> ids of cars of that make
+cars_by_make: Dict[str, Set[int]] = {}
+
+# Response cache for the list endpoints: version counters bumped on every
+# write make stale entries unreachable without explicit invalidation
+garages_version = 0
+cars_version = 0
+_response_cache: Dict[tuple, bytes] = {}
+_RESPONSE_CACHE_MAX = 1024
+
+def _bump_garages_version() -> None:
+    global garages_version
+    garages_version += 1
+
+def _bump_cars_version() -> None:
+    global cars_version
+    cars_version += 1
+
+@lru_cache(maxsize=512)
+def cf(value: str) -> str:
+    # Query strings repeat heavily in practice, so memoize the casefold
+    return value.casefold()
+
+def get_cached_response(cache_key: tuple) -> Optional[bytes]:
+    return _response_cache.get(cache_key)
+
+def cache_response(cache_key: tuple, content: bytes) -> None:
+    if len(_response_cache) >= _RESPONSE_CACHE_MAX:
+        _response_cache.clear()
+    _response_cache[cache_key] = content
+
+
+# Garage-related functions
+def get_garage_by_id(garage_id: int) -> Optional[GarageRecord]:
+    return garages_db.get(garage_id)
+
+def garage_to_dto(garage: GarageRecord) -> GarageDTO:
+    return GarageDTO.model_construct(id=garage.id,
+                                     name=garage.name,
+                                     location=garage.location,
+                                     city=garage.city,
+                                     capacity=garage.capacity)
+
+def _garage_record(garage_id: int, garage_create_dto: GarageCreateDTO) -> GarageRecord:
+    # city_cf is computed once here so reads and index maintenance never
+    # casefold again
+    return GarageRecord(id=garage_id,
+                        name=garage_create_dto.name,
+                        location=garage_create_dto.location,
+                        city=garage_create_dto.city,
+                        capacity=garage_create_dto.capacity,
+                        city_cf=garage_create_dto.city.casefold())
+
+def add_garage_to_db(garage_create_dto: GarageCreateDTO) -> GarageRecord:
+    garage_id = next(_next_garage_id)  # Assign the id to the new garage
+    new_garage = _garage_record(garage_id, garage_create_dto)
+    garages_db[garage_id] = new_garage
+    city_index.setdefault(new_garage.city_cf, set()).add(garage_id)
+    _bump_garages_version()
+    return new_garage
+
+def update_garage_in_db(garage_id: int, garage_create_dto: GarageCreateDTO) -> Optional[GarageRecord]:
+    existing_garage = garages_db.get(garage_id)
+    if not existing_garage:
+        return None
+    _remove_from_city_index(existing_garage)
+    updated_garage = _garage_record(garage_id, garage_create_dto)
+    garages_db[garage_id] = updated_garage
+    city_index.setdefault(updated_garage.city_cf, set()).add(garage_id)
+    _bump_garages_version()
+    return updated_garage
+
+def delete_garage_from_db(garage_id: int) -> Optional[GarageRecord]:
+    # Deletes stay O(1): dict pop plus constant-time index cleanup
+    removed_garage = garages_db.pop(garage_id, None)
+    if removed_garage:
+        _remove_from_city_index(removed_garage)
+        _bump_garages_version()
+    return removed_garage
+
+def _remove_from_city_index(garage: GarageRecord) -> None:
+    bucket = city_index.get(garage.city_cf)
+    if bucket:
+        bucket.discard(garage.id)
+        if not bucket:
+            del city_index[garage.city_cf]
+
+# Car-related functions
+def get_car_by_id(car_id: int) -> Optional[CarRecord]:
+    return cars_db.get(car_id)
+
+def car_to_dto(car: CarRecord) -> CarDTO:
+    # Join the garages lazily so updates to a garage are always reflected
+    return CarDTO.model_construct(id=car.id,
+                                  make=car.make,
+                                  model=car.model,
+                                  productionYear=car.productionYear,
+                                  licensePlate=car.licensePlate,
+                                  garages=[garage_to_dto(garages_db[garage_id])
+                                           for garage_id in car.garage_ids
+                                           if garage_id in garages_db])
+
+def add_car_to_db(car_create_dto: CarCreateDTO) -> CarRecord:
+    car_id = next(_next_car_id)
+    # Keep only ids of garages that actually exist
+    garage_ids = [garage_id for garage_id in car_create_dto.garageIds if garage_id in garages_db]
+    new_car = CarRecord(id=car_id,
+                        make=car_create_dto.make,
+                        model=car_create_dto.model,
+                        productionYear=car_create_dto.productionYear,
+                        licensePlate=car_create_dto.licensePlate,
+                        garage_ids=garage_ids,
+                        make_cf=car_create_dto.make.casefold())
+    cars_db[car_id] = new_car
+    _add_to_car_indexes(new_car)
+    _bump_cars_version()
+    return new_car
+
+def update_car_in_db(car_id: int, car_create_dto: CarCreateDTO) -> Optional[CarRecord]:
+    existing_car = cars_db.get(car_id)
+    if not existing_car:
+        return None
+    _remove_from_car_indexes(existing_car)
+    garage_ids = [garage_id for garage_id in car_create_dto.garageIds if garage_id in garages_db]
+    updated_car = CarRecord(id=car_id,
+                            make=car_create_dto.make,
+                            model=car_create_dto.model,
+                            productionYear=car_create_dto.productionYear,
+                            licensePlate=car_create_dto.licensePlate,
+                            garage_ids=garage_ids,
+                            make_cf=car_create_dto.make.casefold())
+    cars_db[car_id] = updated_car
+    _add_to_car_indexes(updated_car)
+    _bump_cars_version()
+    return updated_car
+
+def delete_car_from_db(car_id: int) -> Optional[CarRecord]:
+    removed_car = cars_db.pop(car_id, None)
+    if removed_car:
+        _remove_from_car_indexes(removed_car)
+        _bump_cars_version()
+    return removed_car
+
+def _add_to_car_indexes(car: CarRecord) -> None:
+    for garage_id in car.garage_ids:
+        cars_by_garage.setdefault(garage_id, set()).add(car.id)
+    year_index.add((car.productionYear, car.id))
+    cars_by_make.setdefault(car.make_cf, set()).add(car.id)
+
+def _remove_from_car_indexes(car: CarRecord) -> None:
+    for garage_id in car.garage_ids:
+        bucket = cars_by_garage.get(garage_id)
+        if bucket:
+            bucket.discard(car.id)
+            if not bucket:
+                del cars_by_garage[garage_id]
+    bucket = cars_by_make.get(car.make_cf)
+    if bucket:
+        bucket.discard(car.id)
+        if not bucket:
+            del cars_by_make[car.make_cf]
+    year_index.remove((car.productionYear, car.id))
+
+def filter_cars(carMake: Optional[str],
+                garageId: Optional[int],
+                fromYear: Optional[int],
+                toYear: Optional[int]) -> List[CarRecord]:
+    # Resolve indexed filters to candidate id sets
+    index_sets: List[Set[int]] = []
+
+    if carMake:
+        index_sets.append(cars_by_make.get(cf(carMake), set()))
+
+    if garageId:
+        index_sets.append(cars_by_garage.get(garageId, set()))
+
+    if fromYear or toYear:
+        index_sets.append({car_id for _, car_id in year_index.irange_key(fromYear, toYear)})
+
+    if not index_sets:
+        return list(cars_db.values())
+
+    # Intersect in one pass, seeded from the smallest set
+    index_sets.sort(key=len)
+    candidate_ids = index_sets[0].intersection(*index_sets[1:])
+    return [cars_db[car_id] for car_id in candidate_ids]